@@ -1,19 +1,26 @@
 from fastapi import FastAPI, Depends, HTTPException, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from sqlmodel import Session, select
-from typing import List
+from sqlalchemy import delete, func, insert
+from typing import Dict, List, Optional
+from datetime import datetime
 import json
 import redis
 import asyncio
 import os
+import time
 from dotenv import load_dotenv
 
 from database import get_session, create_db_and_tables
 from models import (
-    Poll, PollCreate, PollRead, PollWithDetails,
+    Poll, PollCreate, PollRead, PollWithDetails, PollStatus,
     Option, OptionCreate, OptionRead,
     Vote, VoteCreate, VoteRead,
-    Like, LikeCreate, LikeRead
+    Like, LikeCreate, LikeRead,
+    PollSnapshot, OptionSnapshot, ArchivedVote, ArchivedLike,
+    VOTE_ARCHIVE_COLUMNS, LIKE_ARCHIVE_COLUMNS,
+    POLL_READ_COLUMNS, OPTION_READ_COLUMNS, VOTE_READ_COLUMNS, LIKE_READ_COLUMNS
 )
 
 load_dotenv()
@@ -32,23 +39,61 @@ app.add_middleware(
 # Redis connection for real-time updates
 redis_client = redis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379"))
 
+DEBUG = os.getenv("DEBUG", "False").lower() == "true"
+
+# WebSocket capacity settings (seconds / connections per worker).
+# Dead peers are dropped by uvicorn's protocol ping/pong. WS_IDLE_TIMEOUT
+# (0 = off) additionally closes sockets that send no app-level frame; only
+# enable it when every client sends a heartbeat, as frontend/src/lib/websocket.ts does.
+WS_PING_INTERVAL = float(os.getenv("WS_PING_INTERVAL", "20"))
+WS_PING_TIMEOUT = float(os.getenv("WS_PING_TIMEOUT", "20"))
+WS_IDLE_TIMEOUT = float(os.getenv("WS_IDLE_TIMEOUT", "0"))
+WS_MAX_CONNECTIONS = int(os.getenv("WS_MAX_CONNECTIONS", "50000"))
+# Per-message deflate keeps zlib state on every socket; off by default since
+# broadcasts are small JSON and memory per idle socket is the limiting factor
+WS_PER_MESSAGE_DEFLATE = os.getenv("WS_PER_MESSAGE_DEFLATE", "False").lower() == "true"
+
+def current_rss_bytes() -> int:
+    """Resident memory of this worker process"""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource
+        import sys
+        # Peak rather than current RSS; macOS reports bytes, others KiB
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return rss if sys.platform == "darwin" else rss * 1024
+
 # WebSocket connection manager with Redis pub/sub
 class ConnectionManager:
     def __init__(self):
-        self.active_connections: List[WebSocket] = []
+        # WebSocket -> monotonic time of the last inbound frame
+        self.active_connections: Dict[WebSocket, float] = {}
         self.redis_pubsub = redis_client.pubsub()
         self.redis_pubsub.subscribe("poll_updates")
         self._listener_task = None
+        self._reaper_task = None
 
-    async def connect(self, websocket: WebSocket):
+    async def connect(self, websocket: WebSocket) -> bool:
         await websocket.accept()
-        self.active_connections.append(websocket)
+        if len(self.active_connections) >= WS_MAX_CONNECTIONS:
+            # 1013: try again later
+            await websocket.close(code=1013)
+            print(f"WebSocket rejected, worker at capacity ({WS_MAX_CONNECTIONS})")
+            return False
+        self.active_connections[websocket] = time.monotonic()
         print(f"WebSocket connected. Total connections: {len(self.active_connections)}")
+        return True
 
-    def disconnect(self, websocket: WebSocket):
+    def touch(self, websocket: WebSocket):
+        """Record inbound activity on a connection"""
         if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
-        print(f"WebSocket disconnected. Total connections: {len(self.active_connections)}")
+            self.active_connections[websocket] = time.monotonic()
+
+    def disconnect(self, websocket: WebSocket):
+        if self.active_connections.pop(websocket, None) is not None:
+            print(f"WebSocket disconnected. Total connections: {len(self.active_connections)}")
 
     async def send_personal_message(self, message: str, websocket: WebSocket):
         try:
@@ -62,7 +107,7 @@ class ConnectionManager:
             return
             
         disconnected = []
-        for connection in self.active_connections:
+        for connection in list(self.active_connections):
             try:
                 await connection.send_text(message)
             except:
@@ -102,16 +147,45 @@ class ConnectionManager:
                 await asyncio.sleep(1) # Wait before retrying
         print("Redis listener task stopped.")
 
+    async def reap_idle_connections(self):
+        """Close connections that sent nothing (not even a heartbeat) within WS_IDLE_TIMEOUT"""
+        print("WebSocket reaper task started.")
+        while True:
+            try:
+                await asyncio.sleep(max(WS_IDLE_TIMEOUT / 3, 1))
+                cutoff = time.monotonic() - WS_IDLE_TIMEOUT
+                idle = [ws for ws, last_seen in self.active_connections.items() if last_seen < cutoff]
+                for websocket in idle:
+                    self.disconnect(websocket)
+                    try:
+                        # 1001: going away
+                        await websocket.close(code=1001)
+                    except Exception:
+                        pass
+                if idle:
+                    print(f"Reaped {len(idle)} idle WebSocket connections")
+            except asyncio.CancelledError:
+                print("WebSocket reaper task cancelled.")
+                break
+            except Exception as e:
+                print(f"ERROR in WebSocket reaper loop: {e}")
+        print("WebSocket reaper task stopped.")
+
     async def start_listener(self):
-        """Start the Redis listener task"""
+        """Start the Redis listener and idle reaper tasks"""
         if self._listener_task is None:
             self._listener_task = asyncio.create_task(self.start_redis_listener())
+        if self._reaper_task is None and WS_IDLE_TIMEOUT > 0:
+            self._reaper_task = asyncio.create_task(self.reap_idle_connections())
 
     async def stop_listener(self):
-        """Stop the Redis listener task"""
+        """Stop the Redis listener and idle reaper tasks"""
         if self._listener_task:
             self._listener_task.cancel()
             self._listener_task = None
+        if self._reaper_task:
+            self._reaper_task.cancel()
+            self._reaper_task = None
 
 manager = ConnectionManager()
 
@@ -152,50 +226,191 @@ async def create_poll(poll: PollCreate, session: Session = Depends(get_session))
     
     return db_poll
 
+# Read endpoints select the *_READ_COLUMNS tuples and return plain dicts
+# through ORJSONResponse, skipping ORM instances and the response_model
+# validation pass; the response_model still drives OpenAPI.
+def row_dicts(rows) -> List[dict]:
+    """Plain dicts from column-tuple result rows"""
+    return [row._asdict() for row in rows]
+
+def vote_counts_by_option(poll_id: int, session: Session) -> Dict[int, int]:
+    """Live vote count per option of a poll"""
+    return dict(session.exec(
+        select(Vote.option_id, func.count(Vote.id))
+        .where(Vote.poll_id == poll_id)
+        .group_by(Vote.option_id)
+    ).all())
+
 @app.get("/polls/", response_model=List[PollRead])
 async def list_polls(session: Session = Depends(get_session)):
     """List all polls"""
-    statement = select(Poll).order_by(Poll.created_at.desc())
-    polls = session.exec(statement).all()
-    return polls
+    statement = select(*POLL_READ_COLUMNS).order_by(Poll.created_at.desc())
+    polls = row_dicts(session.exec(statement).all())
+    return ORJSONResponse(polls)
 
 @app.get("/polls/{poll_id}", response_model=PollWithDetails)
-async def get_poll(poll_id: int, session: Session = Depends(get_session)):
-    """Get a specific poll with details"""
-    poll = session.get(Poll, poll_id)
+async def get_poll(poll_id: int, user_id: Optional[str] = None, session: Session = Depends(get_session)):
+    """Get a specific poll with details.
+
+    For closed polls only ``user_id``'s own archived vote and like are listed.
+    """
+    poll = session.exec(select(*POLL_READ_COLUMNS).where(Poll.id == poll_id)).first()
     if not poll:
         raise HTTPException(status_code=404, detail="Poll not found")
+    poll_data = poll._asdict()
+    
+    # Closed polls are served from their snapshot
+    if poll_data["status"] == PollStatus.CLOSED:
+        return ORJSONResponse(get_snapshot_details(poll_data, user_id, session))
     
     # Get options with vote counts
-    options = session.exec(select(Option).where(Option.poll_id == poll_id)).all()
-    options_with_counts = []
+    counts = vote_counts_by_option(poll_id, session)
+    options = row_dicts(session.exec(select(*OPTION_READ_COLUMNS).where(Option.poll_id == poll_id)).all())
     for option in options:
-        vote_count = len(session.exec(select(Vote).where(Vote.option_id == option.id)).all())
-        option_data = OptionRead.model_validate(option)
-        option_data.vote_count = vote_count
-        options_with_counts.append(option_data)
+        option["vote_count"] = counts.get(option["id"], 0)
     
     # Get votes and likes
-    votes = session.exec(select(Vote).where(Vote.poll_id == poll_id)).all()
-    likes = session.exec(select(Like).where(Like.poll_id == poll_id)).all()
+    votes = row_dicts(session.exec(select(*VOTE_READ_COLUMNS).where(Vote.poll_id == poll_id)).all())
+    likes = row_dicts(session.exec(select(*LIKE_READ_COLUMNS).where(Like.poll_id == poll_id)).all())
     
-    poll_data = PollWithDetails.model_validate(poll)
-    poll_data.options = options_with_counts
-    poll_data.votes = votes
-    poll_data.likes = likes
-    poll_data.total_votes = len(votes)
-    poll_data.total_likes = len(likes)
+    poll_data["options"] = options
+    poll_data["votes"] = votes
+    poll_data["likes"] = likes
+    poll_data["total_votes"] = len(votes)
+    poll_data["total_likes"] = len(likes)
     
+    return ORJSONResponse(poll_data)
+
+def get_snapshot_details(poll_data: dict, user_id: Optional[str], session: Session) -> dict:
+    """Build poll details for a closed poll from its frozen snapshot"""
+    poll_id = poll_data["id"]
+    snapshot = session.get(PollSnapshot, poll_id)
+    counts = dict(session.exec(
+        select(OptionSnapshot.option_id, OptionSnapshot.vote_count).where(OptionSnapshot.poll_id == poll_id)
+    ).all())
+
+    options = row_dicts(session.exec(select(*OPTION_READ_COLUMNS).where(Option.poll_id == poll_id)).all())
+    for option in options:
+        option["vote_count"] = counts.get(option["id"], 0)
+
+    # Raw votes and likes are archived; only the caller's own are looked up
+    votes, likes = [], []
+    if user_id is not None:
+        votes = row_dicts(session.exec(
+            select(*(getattr(ArchivedVote, column.key) for column in VOTE_READ_COLUMNS))
+            .where(ArchivedVote.poll_id == poll_id, ArchivedVote.user_id == user_id)
+        ).all())
+        likes = row_dicts(session.exec(
+            select(*(getattr(ArchivedLike, column.key) for column in LIKE_READ_COLUMNS))
+            .where(ArchivedLike.poll_id == poll_id, ArchivedLike.user_id == user_id)
+        ).all())
+
+    poll_data["options"] = options
+    poll_data["votes"] = votes
+    poll_data["likes"] = likes
+    poll_data["total_votes"] = snapshot.total_votes if snapshot else 0
+    poll_data["total_likes"] = snapshot.total_likes if snapshot else 0
+
     return poll_data
 
+def get_locked_poll(poll_id: int, session: Session, read: bool = False) -> Poll:
+    """Get a poll and lock its row until commit.
+
+    Close/reopen take the exclusive lock (FOR UPDATE). Writes to a poll's votes,
+    likes and options take the shared one (``read=True``, FOR SHARE), so they
+    run concurrently with each other but cannot slip in while rows are being moved.
+    """
+    poll = session.exec(select(Poll).where(Poll.id == poll_id).with_for_update(read=read)).first()
+    if not poll:
+        raise HTTPException(status_code=404, detail="Poll not found")
+    return poll
+
+def get_open_poll(poll_id: int, session: Session, read: bool = True) -> Poll:
+    """Get and lock a poll that still accepts options, votes and likes"""
+    poll = get_locked_poll(poll_id, session, read=read)
+    if poll.status == PollStatus.CLOSED:
+        raise HTTPException(status_code=409, detail="Poll is closed")
+    return poll
+
+def move_poll_rows(source, target, columns, poll_id: int, session: Session):
+    """Move a poll's rows between a live table and its archive, keeping ids and timestamps"""
+    session.execute(insert(target).from_select(
+        columns,
+        select(*(getattr(source, column) for column in columns)).where(source.poll_id == poll_id)
+    ))
+    session.execute(delete(source).where(source.poll_id == poll_id))
+
+# Poll management endpoints
+@app.post("/polls/{poll_id}/close/", response_model=PollRead)
+async def close_poll(poll_id: int, session: Session = Depends(get_session)):
+    """Close a poll: snapshot its tally and archive its raw votes and likes"""
+    poll = get_open_poll(poll_id, session, read=False)
+
+    # Freeze the tally
+    option_counts = vote_counts_by_option(poll_id, session)
+    total_likes = session.exec(select(func.count(Like.id)).where(Like.poll_id == poll_id)).one()
+    for option_id, vote_count in option_counts.items():
+        session.add(OptionSnapshot(option_id=option_id, poll_id=poll_id, vote_count=vote_count))
+    session.add(PollSnapshot(
+        poll_id=poll_id,
+        total_votes=sum(option_counts.values()),
+        total_likes=total_likes,
+    ))
+
+    # Move raw rows to the archive tables
+    move_poll_rows(Vote, ArchivedVote, VOTE_ARCHIVE_COLUMNS, poll_id, session)
+    move_poll_rows(Like, ArchivedLike, LIKE_ARCHIVE_COLUMNS, poll_id, session)
+
+    poll.status = PollStatus.CLOSED
+    poll.updated_at = datetime.utcnow()
+    session.add(poll)
+    session.commit()
+    session.refresh(poll)
+
+    # Broadcast update via Redis
+    await manager.publish_update({
+        "type": "poll_closed",
+        "poll_id": poll_id,
+        "poll": PollRead.model_validate(poll).dict()
+    })
+
+    return poll
+
+@app.post("/polls/{poll_id}/reopen/", response_model=PollRead)
+async def reopen_poll(poll_id: int, session: Session = Depends(get_session)):
+    """Reopen a closed poll: restore its archived votes and likes"""
+    poll = get_locked_poll(poll_id, session)
+    if poll.status != PollStatus.CLOSED:
+        raise HTTPException(status_code=409, detail="Poll is not closed")
+
+    move_poll_rows(ArchivedVote, Vote, VOTE_ARCHIVE_COLUMNS, poll_id, session)
+    move_poll_rows(ArchivedLike, Like, LIKE_ARCHIVE_COLUMNS, poll_id, session)
+
+    # Live counts take over again
+    session.execute(delete(OptionSnapshot).where(OptionSnapshot.poll_id == poll_id))
+    session.execute(delete(PollSnapshot).where(PollSnapshot.poll_id == poll_id))
+
+    poll.status = PollStatus.ACTIVE
+    poll.updated_at = datetime.utcnow()
+    session.add(poll)
+    session.commit()
+    session.refresh(poll)
+
+    # Broadcast update via Redis
+    await manager.publish_update({
+        "type": "poll_reopened",
+        "poll_id": poll_id,
+        "poll": PollRead.model_validate(poll).dict()
+    })
+
+    return poll
+
 # Option endpoints
 @app.post("/polls/{poll_id}/options/", response_model=OptionRead)
 async def add_option(poll_id: int, option: OptionCreate, session: Session = Depends(get_session)):
     """Add an option to a poll"""
-    # Check if poll exists
-    poll = session.get(Poll, poll_id)
-    if not poll:
-        raise HTTPException(status_code=404, detail="Poll not found")
+    # Check if poll exists and is still open
+    get_open_poll(poll_id, session)
     
     db_option = Option.model_validate(option)
     db_option.poll_id = poll_id
@@ -216,10 +431,8 @@ async def add_option(poll_id: int, option: OptionCreate, session: Session = Depe
 @app.post("/polls/{poll_id}/vote/", response_model=VoteRead)
 async def vote(poll_id: int, vote: VoteCreate, session: Session = Depends(get_session)):
     """Vote on a poll"""
-    # Check if poll exists
-    poll = session.get(Poll, poll_id)
-    if not poll:
-        raise HTTPException(status_code=404, detail="Poll not found")
+    # Check if poll exists and is still open
+    get_open_poll(poll_id, session)
     
     # Check if user already voted on this poll
     existing_vote = session.exec(
@@ -255,10 +468,8 @@ async def vote(poll_id: int, vote: VoteCreate, session: Session = Depends(get_se
 @app.post("/polls/{poll_id}/like/", response_model=LikeRead)
 async def like_poll(poll_id: int, like: LikeCreate, session: Session = Depends(get_session)):
     """Like a poll"""
-    # Check if poll exists
-    poll = session.get(Poll, poll_id)
-    if not poll:
-        raise HTTPException(status_code=404, detail="Poll not found")
+    # Check if poll exists and is still open
+    get_open_poll(poll_id, session)
     
     # Check if user already liked this poll
     existing_like = session.exec(
@@ -290,17 +501,34 @@ async def like_poll(poll_id: int, like: LikeCreate, session: Session = Depends(g
 # WebSocket endpoint
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
-    """WebSocket endpoint for real-time updates"""
-    await manager.connect(websocket)
+    """WebSocket endpoint for real-time updates.
+
+    Dead peers are detected by protocol-level ping/pong (see WS_PING_INTERVAL /
+    WS_PING_TIMEOUT passed to uvicorn). Inbound frames are only the optional
+    client heartbeat and are not answered.
+    """
+    if not await manager.connect(websocket):
+        return
     try:
         while True:
-            # Keep connection alive
-            data = await websocket.receive_text()
-            # Echo back (optional)
-            await websocket.send_text(f"Echo: {data}")
+            await websocket.receive_text()
+            manager.touch(websocket)
     except WebSocketDisconnect:
+        pass
+    finally:
         manager.disconnect(websocket)
 
+@app.get("/ws/stats", include_in_schema=DEBUG)
+async def websocket_stats():
+    """Connection count and memory of this worker (DEBUG only, used by test_ws_capacity.py)"""
+    if not DEBUG:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return {
+        "connections": len(manager.active_connections),
+        "max_connections": WS_MAX_CONNECTIONS,
+        "rss_bytes": current_rss_bytes(),
+    }
+
 @app.get("/")
 async def root():
     """Root endpoint"""
@@ -308,4 +536,11 @@ async def root():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=8000,
+        ws_ping_interval=WS_PING_INTERVAL,
+        ws_ping_timeout=WS_PING_TIMEOUT,
+        ws_per_message_deflate=WS_PER_MESSAGE_DEFLATE,
+    )
@@ -112,3 +112,44 @@ class PollWithDetails(PollRead):
     likes: List["LikeRead"] = []
     total_votes: int = 0
     total_likes: int = 0
+
+
+# Columns in read-model field order, for building responses from result rows
+POLL_READ_COLUMNS = (Poll.title, Poll.description, Poll.status, Poll.id, Poll.created_at, Poll.updated_at)
+OPTION_READ_COLUMNS = (Option.text, Option.poll_id, Option.id, Option.created_at)
+VOTE_READ_COLUMNS = (Vote.poll_id, Vote.option_id, Vote.user_id, Vote.id, Vote.created_at)
+LIKE_READ_COLUMNS = (Like.poll_id, Like.user_id, Like.id, Like.created_at)
+
+
+# Frozen results of a closed poll
+class PollSnapshot(SQLModel, table=True):
+    poll_id: int = Field(foreign_key="poll.id", primary_key=True)
+    total_votes: int = 0
+    total_likes: int = 0
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class OptionSnapshot(SQLModel, table=True):
+    option_id: int = Field(foreign_key="option.id", primary_key=True)
+    poll_id: int = Field(foreign_key="poll.id", index=True)
+    vote_count: int = 0
+
+
+# Raw rows moved out of the hot tables while a poll is closed
+# Columns copied between the live and archive tables
+VOTE_ARCHIVE_COLUMNS = ("id", "poll_id", "option_id", "user_id", "created_at")
+LIKE_ARCHIVE_COLUMNS = ("id", "poll_id", "user_id", "created_at")
+
+
+class ArchivedVote(VoteBase, table=True):
+    id: int = Field(primary_key=True)
+    poll_id: int = Field(foreign_key="poll.id", index=True)
+    created_at: datetime
+    archived_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class ArchivedLike(LikeBase, table=True):
+    id: int = Field(primary_key=True)
+    poll_id: int = Field(foreign_key="poll.id", index=True)
+    created_at: datetime
+    archived_at: datetime = Field(default_factory=datetime.utcnow)
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the GET /polls/ serialization path
+
+Compares the old path (ORM instances run through FastAPI's own
+serialize_response for the List[PollRead] response_model, including its
+per-instance model_dump, then JSONResponse) with the new one (rows for the
+shared POLL_READ_COLUMNS turned into dicts and rendered by ORJSONResponse) on an
+in-memory SQLite database. Routing, dependency injection and I/O are left out
+of both paths.
+
+    python bench_serialization.py
+"""
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from sqlmodel import SQLModel, Session, create_engine, select
+
+from backend.models import Poll, PollRead, POLL_READ_COLUMNS
+
+POLL_COUNTS = [1000, 10000]
+REPEATS = 5
+
+# The same field FastAPI builds for response_model=List[PollRead]
+response_field = create_response_field(name="Response_list_polls", type_=List[PollRead], mode="serialization")
+loop = asyncio.new_event_loop()
+
+
+def old_path(session: Session) -> bytes:
+    """ORM rows -> serialize_response (model_dump, validate, dump) -> JSONResponse"""
+    polls = session.exec(select(Poll).order_by(Poll.created_at.desc())).all()
+    content = loop.run_until_complete(serialize_response(field=response_field, response_content=polls))
+    return JSONResponse(content).body
+
+
+def new_path(session: Session) -> bytes:
+    """Column-tuple rows -> dicts -> ORJSONResponse"""
+    rows = session.exec(select(*POLL_READ_COLUMNS).order_by(Poll.created_at.desc())).all()
+    return ORJSONResponse([row._asdict() for row in rows]).body
+
+
+def best_of(func, engine) -> float:
+    timings = []
+    for _ in range(REPEATS):
+        # Fresh session so the ORM identity map does not carry over between runs
+        with Session(engine) as session:
+            started = time.perf_counter()
+            func(session)
+            timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def run(poll_count: int):
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    now = datetime.utcnow()
+    with Session(engine) as session:
+        session.add_all(
+            Poll(title=f"Poll {i}", description="Benchmark poll", created_at=now - timedelta(seconds=i), updated_at=now)
+            for i in range(poll_count)
+        )
+        session.commit()
+
+    with Session(engine) as session:
+        assert json.loads(old_path(session)) == json.loads(new_path(session)), "Paths produce different JSON"
+
+    old = best_of(old_path, engine)
+    new = best_of(new_path, engine)
+    print(f"{poll_count:>6} polls: old {old * 1000:8.1f} ms   new {new * 1000:8.1f} ms   speedup {old / new:4.1f}x")
+
+
+if __name__ == "__main__":
+    print(f"GET /polls/ serialization, best of {REPEATS}")
+    for poll_count in POLL_COUNTS:
+        run(poll_count)
